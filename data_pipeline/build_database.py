@@ -1,19 +1,126 @@
 # This is the final, production-ready ETL script for the hackathon.
-# It connects to the LOCAL PostgreSQL database, as specified in the problem statement.
+# It connects to the PostgreSQL database from .env (local by default) or the one given with --target-url.
 
+import argparse
+import csv
 import os
+from io import StringIO
+
+import numpy as np
 import xarray as xr
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy import text
 from dotenv import load_dotenv
 
-def main():
+
+def psql_insert_copy(table, conn, keys, data_iter):
+    """Stream a ``DataFrame.to_sql`` batch into PostgreSQL using ``COPY FROM STDIN``."""
+    dbapi_conn = conn.connection
+    with dbapi_conn.cursor() as cursor:
+        buffer = StringIO()
+        csv.writer(buffer).writerows(data_iter)
+        buffer.seek(0)
+
+        columns = ", ".join(f'"{key}"' for key in keys)
+        table_name = f"{table.schema}.{table.name}" if table.schema else table.name
+        cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH CSV", buffer)
+
+
+def drop_secondary_indexes(connection, table_name):
+    """Drop the table's non-constraint indexes and return the DDL needed to rebuild them."""
+    index_rows = connection.execute(
+        text(
+            "SELECT i.indexname, i.indexdef FROM pg_indexes i "
+            "WHERE i.schemaname = current_schema() AND i.tablename = :table_name "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname)"
+        ),
+        {"table_name": table_name},
+    ).all()
+
+    for index_name, _ in index_rows:
+        connection.execute(text(f'DROP INDEX "{index_name}"'))
+    return [index_def for _, index_def in index_rows]
+
+
+# ARGO files are not consistent about variable casing, so try each spelling in turn.
+PROFILE_VARIABLE_NAMES = {
+    'profile_date': ['juld', 'JULD'], 'latitude': ['latitude', 'LATITUDE'],
+    'longitude': ['longitude', 'LONGITUDE'], 'pressure': ['pres_adjusted', 'PRES_ADJUSTED'],
+    'temperature': ['temp_adjusted', 'TEMP_ADJUSTED'], 'salinity': ['psal_adjusted', 'PSAL_ADJUSTED']
+}
+
+
+def process_profile_file(file_path):
+    """Extract one profile file into an ``argo_profiles``-shaped DataFrame.
+
+    Only the six required variables are read, as raw arrays. Per-profile values
+    (date, position) are repeated across the profile's depth levels, and levels
+    with no temperature or salinity reading are removed with a single vectorized
+    mask instead of a row-by-row check.
+    """
+    filename = os.path.basename(file_path)
+
+    # --- Smart Attribute Selection ---
+    arrays = {}
+    with xr.open_dataset(file_path) as dataset:
+        for clean_name, ugly_names in PROFILE_VARIABLE_NAMES.items():
+            for ugly_name in ugly_names:
+                if ugly_name in dataset.variables:
+                    arrays[clean_name] = dataset[ugly_name].values
+                    break
+    if len(arrays) != 6: raise KeyError("Could not find all required variables.")
+
+    pres_arr = np.atleast_2d(arrays['pressure'])
+    temp_arr = np.atleast_2d(arrays['temperature'])
+    psal_arr = np.atleast_2d(arrays['salinity'])
+    n_levels = pres_arr.shape[1]
+
+    valid = ~(np.isnan(temp_arr) | np.isnan(psal_arr)).ravel()
+
+    final_df = pd.DataFrame({
+        'profile_date': np.repeat(np.ravel(arrays['profile_date']), n_levels)[valid],
+        'latitude': np.repeat(np.ravel(arrays['latitude']), n_levels)[valid],
+        'longitude': np.repeat(np.ravel(arrays['longitude']), n_levels)[valid],
+        'pressure': pres_arr.ravel()[valid],
+        'temperature': temp_arr.ravel()[valid],
+        'salinity': psal_arr.ravel()[valid],
+    })
+
+    float_id = int(filename.split('_')[0].replace('D', '').replace('R', ''))
+    final_df['float_id'] = float_id
+    return final_df
+
+
+def parse_args(argv=None):
+    """Parse the ETL command-line switches."""
+    parser = argparse.ArgumentParser(description="Load ARGO profile NetCDF files into PostgreSQL.")
+    parser.add_argument(
+        "--sample-stride", type=int, default=1,
+        help="Load every Nth profile file only (default: 1, i.e. every file).",
+    )
+    parser.add_argument(
+        "--target-url", default=None,
+        help="SQLAlchemy URL of the target database. Overrides DATABASE_URL and the DB_* settings.",
+    )
+    parser.add_argument(
+        "--truncate", action=argparse.BooleanOptionalAction, default=True,
+        help="Clear 'argo_profiles' before loading (default: on). Use --no-truncate to append.",
+    )
+    args = parser.parse_args(argv)
+    if args.sample_stride < 1:
+        parser.error("--sample-stride must be a positive integer.")
+    return args
+
+
+def main(argv=None):
     """The main function to run the entire ETL process."""
+    args = parse_args(argv)
+
     # --- Securely Load Configuration ---
     load_dotenv()
 
-    database_url = os.getenv("DATABASE_URL")
+    database_url = args.target_url or os.getenv("DATABASE_URL")
     db_password = os.getenv("DB_PASSWORD")
     db_user = os.getenv("DB_USER", "postgres")
     db_host = os.getenv("DB_HOST", "localhost")
@@ -28,7 +135,6 @@ def main():
     root_data_folder = 'nc files'
 
     print(f"--- Starting Bulk ETL Process for folder: '{root_data_folder}' ---")
-    print(f"--- Target Database: Local PostgreSQL ---")
 
     # --- Database Connection ---
     try:
@@ -36,22 +142,13 @@ def main():
             f"postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
         )
         engine = create_engine(connection_string)
-        print("✅ Local database engine created successfully.")
+        target_database = engine.url.render_as_string(hide_password=True)
+        print(f"--- Target Database: {target_database} ---")
+        print("✅ Database engine created successfully.")
     except Exception as e:
-        print(f"❌ Failed to create local database engine. Error: {e}")
+        print(f"❌ Failed to create database engine. Error: {e}")
         exit()
 
-    # --- Clear the table for a fresh start ---
-    print("Clearing the 'argo_profiles' table for a fresh load...")
-    try:
-        with engine.connect() as connection:
-            connection.execute(text("TRUNCATE TABLE argo_profiles RESTART IDENTITY;"))
-            connection.commit()
-        print("✅ 'argo_profiles' table has been cleared.")
-    except Exception as e:
-        print(f"⚠️ Could not clear table (it might not exist yet, which is okay). Error: {e}")
-
-
     # --- Recursively find all profile files ---
     nc_files_to_process = []
     for root, dirs, files in os.walk(root_data_folder):
@@ -62,51 +159,66 @@ def main():
     if not nc_files_to_process:
         print(f"⚠️ No profile (.nc) files found in '{root_data_folder}'. Exiting.")
         exit()
+    if args.sample_stride > 1:
+        nc_files_to_process = sorted(nc_files_to_process)[::args.sample_stride]
+        print(f"Sampling every {args.sample_stride} file(s).")
     print(f"Found {len(nc_files_to_process)} profile files to process.")
 
 
-    # --- Loop through each file and process it ---
-    total_rows_loaded = 0
+    # --- Loop through each file and extract it ---
+    extracted_frames = []
     for file_path in nc_files_to_process:
         filename = os.path.basename(file_path)
         print(f"\n--- Processing file: {filename} ---", end="")
 
         try:
-            dataset = xr.open_dataset(file_path)
-            argo_df = dataset.to_dataframe().reset_index()
-
-            # --- Smart Attribute Selection ---
-            column_map = {}
-            potential_names = {
-                'profile_date': ['juld', 'JULD'], 'latitude': ['latitude', 'LATITUDE'],
-                'longitude': ['longitude', 'LONGITUDE'], 'pressure': ['pres_adjusted', 'PRES_ADJUSTED'],
-                'temperature': ['temp_adjusted', 'TEMP_ADJUSTED'], 'salinity': ['psal_adjusted', 'PSAL_ADJUSTED']
-            }
-            for clean_name, ugly_names in potential_names.items():
-                for ugly_name in ugly_names:
-                    if ugly_name in argo_df.columns:
-                        column_map[ugly_name] = clean_name
-                        break
-            if len(column_map) != 6: raise KeyError("Could not find all required variables.")
-
-            final_df = argo_df[list(column_map.keys())].copy()
-            final_df.rename(columns=column_map, inplace=True)
-
-            float_id = int(filename.split('_')[0].replace('D', '').replace('R', ''))
-            final_df['float_id'] = float_id
-
-            # LOAD
-            final_df.to_sql('argo_profiles', engine, if_exists='append', index=False)
-
-            rows_loaded = len(final_df)
-            total_rows_loaded += rows_loaded
-            print(f" ✅ Success: Loaded {rows_loaded} rows.")
+            final_df = process_profile_file(file_path)
+            extracted_frames.append(final_df)
+            print(f" ✅ Success: Extracted {len(final_df)} rows.")
 
         except Exception as e:
             print(f" ⚠️ SKIPPING FILE: Could not process {filename}. Error: {e}")
 
+    if not extracted_frames:
+        print("⚠️ No rows could be extracted from the profile files. Exiting.")
+        exit()
+
+    # --- LOAD: one transaction, one COPY stream, one commit ---
+    # Every file used to commit on its own, paying a WAL fsync each time. Loading
+    # inside a single transaction with synchronous_commit off means one flush at the
+    # end, and a failed load leaves the previous table contents untouched.
+    all_rows_df = pd.concat(extracted_frames, ignore_index=True)
+    print(f"\nLoading {len(all_rows_df)} rows into 'argo_profiles' in a single transaction...")
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("SET LOCAL synchronous_commit = off"))
+
+            index_definitions = []
+            if args.truncate and inspect(connection).has_table("argo_profiles"):
+                connection.execute(text("TRUNCATE TABLE argo_profiles RESTART IDENTITY;"))
+                print("✅ 'argo_profiles' table has been cleared.")
+
+                # Rebuilding each index once after the COPY is far cheaper than
+                # maintaining it row by row during the load.
+                index_definitions = drop_secondary_indexes(connection, "argo_profiles")
+                if index_definitions:
+                    print(f"Dropped {len(index_definitions)} index(es); they will be rebuilt after the load.")
+
+            all_rows_df.to_sql(
+                'argo_profiles', connection, if_exists='append', index=False, method=psql_insert_copy
+            )
+
+            for index_definition in index_definitions:
+                connection.execute(text(index_definition))
+            if index_definitions:
+                print(f"✅ Rebuilt {len(index_definitions)} index(es) on 'argo_profiles'.")
+    except Exception as e:
+        print(f"❌ Bulk load failed and was rolled back. Error: {e}")
+        exit()
+
+    total_rows_loaded = len(all_rows_df)
     print(f"\n--- Bulk ETL Process Finished ---")
-    print(f"🎉 Total rows loaded into the local PostgreSQL database: {total_rows_loaded}")
+    print(f"🎉 Total rows loaded into {target_database}: {total_rows_loaded}")
 
 # --- This is the "Ignition Switch" that starts the engine ---
 # This is the standard way to make a Python script runnable.
@@ -7,11 +7,14 @@ import { Slider } from "@/components/ui/slider";
 import { Badge } from "@/components/ui/badge";
 import { ScrollArea } from "@/components/ui/scroll-area";
 import CodeSnippet from "./CodeSnippet";
-import { lazy, Suspense, useMemo } from "react";
+import { loadGeoPlot, loadProfilePlot } from "@/lib/plotly";
+import { lazy, Suspense, useMemo, useState } from "react";
 import type { Dispatch, SetStateAction } from "react";
+import type { Config, Data, Layout } from "plotly.js";
 import { BarChart2, Globe2, LineChart, Code } from "lucide-react";
 
-const Plot = lazy(() => import("react-plotly.js"));
+const GeoPlot = lazy(loadGeoPlot);
+const ProfilePlot = lazy(loadProfilePlot);
 
 type PersonaMode = "guided" | "expert";
 
@@ -91,6 +94,201 @@ const extractNumericValues = (rows: Record<string, any>[], key: string) =>
     .map((row) => (typeof row[key] === "number" && !Number.isNaN(row[key]) ? (row[key] as number) : null))
     .filter((value): value is number => value !== null);
 
+// WebGL traces carry a context setup cost that only pays off once a profile has many levels.
+const WEBGL_POINT_THRESHOLD = 1000;
+
+const profileTraceType = (pointCount: number): "scatter" | "scattergl" =>
+  pointCount > WEBGL_POINT_THRESHOLD ? "scattergl" : "scatter";
+
+// Result sets with more profile points than this are thinned with Largest-Triangle-Three-Buckets.
+const PROFILE_DOWNSAMPLE_THRESHOLD = 2000;
+const PROFILE_DOWNSAMPLE_TARGET = 1500;
+
+// LTTB always keeps a profile's first, last and at least one middle point.
+const LTTB_MIN_POINTS = 3;
+
+// Largest-Triangle-Three-Buckets: keeps the first and last points, then from each bucket the
+// point forming the largest triangle with the previous pick and the next bucket's average.
+const lttbIndices = (xs: number[], ys: number[], target: number) => {
+  const length = xs.length;
+  if (target >= length || target < LTTB_MIN_POINTS) {
+    return xs.map((_, index) => index);
+  }
+
+  const indices = [0];
+  const bucketSize = (length - 2) / (target - 2);
+  let anchor = 0;
+
+  for (let bucket = 0; bucket < target - 2; bucket += 1) {
+    const avgStart = Math.floor((bucket + 1) * bucketSize) + 1;
+    const avgEnd = Math.min(Math.floor((bucket + 2) * bucketSize) + 1, length);
+    let avgX = 0;
+    let avgY = 0;
+    for (let i = avgStart; i < avgEnd; i += 1) {
+      avgX += xs[i];
+      avgY += ys[i];
+    }
+    avgX /= avgEnd - avgStart;
+    avgY /= avgEnd - avgStart;
+
+    const rangeStart = Math.floor(bucket * bucketSize) + 1;
+    const rangeEnd = Math.floor((bucket + 1) * bucketSize) + 1;
+    let maxArea = -1;
+    let picked = rangeStart;
+    for (let i = rangeStart; i < rangeEnd; i += 1) {
+      const area = Math.abs((xs[anchor] - avgX) * (ys[i] - ys[anchor]) - (xs[anchor] - xs[i]) * (avgY - ys[anchor]));
+      if (area > maxArea) {
+        maxArea = area;
+        picked = i;
+      }
+    }
+
+    indices.push(picked);
+    anchor = picked;
+  }
+
+  indices.push(length - 1);
+  return indices;
+};
+
+// `level` is the pressure rounded to 0.01 dbar, the resolution at which repeated readings are merged.
+type ProfilePoint = { value: number; pressure: number; level: number };
+
+// A result set usually holds many profiles, so rows are grouped per profile (float + profile
+// date) and each one is drawn as its own sweep down the water column.
+const profileKey = (row: Record<string, any>) => `${row.float_id ?? ""}|${row.profile_date ?? ""}`;
+
+// Cheap check for at least one plottable point; stops at the first match instead of building the series.
+const hasProfileData = (rows: Record<string, any>[], key: string) =>
+  rows.some((row) => Number.isFinite(row[key]) && Number.isFinite(row.pressure));
+
+type ProfileSeries = { values: (number | null)[]; pressures: (number | null)[] };
+
+const EMPTY_PROFILE_SERIES: ProfileSeries = { values: [], pressures: [] };
+
+// Returns the plottable (value, pressure) pairs of every profile, each ordered by pressure with
+// one reading kept per 0.01 dbar level. Profiles are joined with null separators so
+// Plotly breaks the line between them instead of connecting one profile to the next.
+const buildProfileSeries = (rows: Record<string, any>[], key: string): ProfileSeries => {
+  const profiles = new Map<string, ProfilePoint[]>();
+  rows.forEach((row) => {
+    const value = row[key];
+    const pressure = row.pressure;
+    if (typeof value === "number" && Number.isFinite(value) && typeof pressure === "number" && Number.isFinite(pressure)) {
+      const groupKey = profileKey(row);
+      const point = { value, pressure, level: Math.round(pressure * 100) };
+      const points = profiles.get(groupKey);
+      if (points) {
+        points.push(point);
+      } else {
+        profiles.set(groupKey, [point]);
+      }
+    }
+  });
+
+  const cleaned: { values: number[]; pressures: number[] }[] = [];
+  let totalPoints = 0;
+  profiles.forEach((points) => {
+    // Sorting on the rounded level puts every reading of a level next to each other, so
+    // keeping the first point of each run leaves one reading per level.
+    points.sort((a, b) => a.level - b.level);
+
+    const profileValues: number[] = [];
+    const profilePressures: number[] = [];
+    let lastLevel = NaN;
+    points.forEach(({ value, pressure, level }) => {
+      if (level !== lastLevel) {
+        lastLevel = level;
+        profileValues.push(value);
+        profilePressures.push(pressure);
+      }
+    });
+
+    cleaned.push({ values: profileValues, pressures: profilePressures });
+    totalPoints += profileValues.length;
+  });
+
+  // Past the threshold the plotted points are bounded by the target. Each profile is downsampled
+  // on its own (LTTB needs an ordered x axis), and LTTB cannot thin a profile below 3 points, so
+  // when there are more profiles than the target can hold 3 points of, only every k-th is drawn.
+  let drawn = cleaned;
+  let budgets: number[] | null = null;
+  if (totalPoints > PROFILE_DOWNSAMPLE_THRESHOLD) {
+    let drawnPoints = totalPoints;
+    const maxProfiles = Math.floor(PROFILE_DOWNSAMPLE_TARGET / LTTB_MIN_POINTS);
+    if (cleaned.length > maxProfiles) {
+      const stride = Math.ceil(cleaned.length / maxProfiles);
+      drawn = cleaned.filter((_, index) => index % stride === 0);
+      drawnPoints = drawn.reduce((sum, profile) => sum + profile.values.length, 0);
+    }
+
+    // Every drawn profile keeps up to 3 points, and the rest of the budget is shared in proportion
+    // to the points each has beyond those, so the budgets never add up to more than the target.
+    if (drawnPoints > PROFILE_DOWNSAMPLE_TARGET) {
+      const reserved = drawn.map((profile) => Math.min(profile.values.length, LTTB_MIN_POINTS));
+      const reservedTotal = reserved.reduce((sum, count) => sum + count, 0);
+      const spare = PROFILE_DOWNSAMPLE_TARGET - reservedTotal;
+      const extraTotal = drawnPoints - reservedTotal;
+      budgets = drawn.map(
+        (profile, index) =>
+          reserved[index] + Math.floor((spare * (profile.values.length - reserved[index])) / extraTotal),
+      );
+    }
+  }
+
+  const values: (number | null)[] = [];
+  const pressures: (number | null)[] = [];
+  drawn.forEach((profile, profileIndex) => {
+    const keep = budgets ? lttbIndices(profile.pressures, profile.values, budgets[profileIndex]) : null;
+
+    if (values.length) {
+      values.push(null);
+      pressures.push(null);
+    }
+    (keep ?? profile.values.map((_, index) => index)).forEach((index) => {
+      values.push(profile.values[index]);
+      pressures.push(profile.pressures[index]);
+    });
+  });
+
+  return { values, pressures };
+};
+
+// Chart layouts never change, so they are built once here instead of on every render.
+// Handing Plotly the same layout object lets its update diff skip layout work entirely.
+const GRID_COLOR = "rgba(148, 163, 184, 0.3)";
+
+const MAP_LAYOUT: Partial<Layout> = {
+  geo: {
+    scope: "world",
+    showland: true,
+    landcolor: "#f1f5f9",
+    oceancolor: "#e2e8f0",
+    lakecolor: "#e2e8f0",
+    projection: { type: "natural earth" },
+    lonaxis: { showgrid: true, gridcolor: GRID_COLOR, dtick: 30 },
+    lataxis: { showgrid: true, gridcolor: GRID_COLOR, dtick: 15 },
+  },
+  margin: { r: 0, t: 10, b: 0, l: 0 },
+  paper_bgcolor: "rgba(0,0,0,0)",
+  plot_bgcolor: "rgba(0,0,0,0)",
+};
+
+const MAP_CONFIG: Partial<Config> = { displayModeBar: false, responsive: true };
+const MAP_STYLE = { width: "100%", height: "100%" };
+
+const buildProfileLayout = (title: string, xAxisTitle: string): Partial<Layout> => ({
+  title: { text: title },
+  paper_bgcolor: "rgba(0,0,0,0)",
+  plot_bgcolor: "rgba(0,0,0,0)",
+  yaxis: { autorange: "reversed", title: { text: "Pressure (dbar)" }, gridcolor: GRID_COLOR },
+  xaxis: { title: { text: xAxisTitle }, gridcolor: GRID_COLOR },
+});
+
+const TEMPERATURE_PROFILE_LAYOUT = buildProfileLayout("Temperature vs. Depth", "Temperature (°C)");
+const SALINITY_PROFILE_LAYOUT = buildProfileLayout("Salinity vs. Depth", "Salinity (PSU)");
+const PROFILE_STYLE = { width: "100%", height: "360px" };
+
 const PlotFallback = ({ label }: { label: string }) => (
   <div className="flex h-full min-h-[260px] w-full items-center justify-center text-[0.65rem] uppercase tracking-[0.28em] text-subtle">
     {label}
@@ -158,13 +356,69 @@ const DataVisualization = ({
   );
 
   const hasLocationData = locationPoints.length > 0;
-  const hasTempProfileData = useMemo(
-    () => workingData.length > 0 && "temperature" in workingData[0] && "pressure" in workingData[0],
-    [workingData],
+  // A profile chart is only worth loading Plotly for when it has at least one plottable point;
+  // columns that are present but entirely null no longer render an empty figure.
+  const hasTempProfileData = useMemo(() => hasProfileData(workingData, "temperature"), [workingData]);
+  const hasSalProfileData = useMemo(() => hasProfileData(workingData, "salinity"), [workingData]);
+
+  // Grouping, sorting and downsampling the profiles is deferred until the Profiles tab is first
+  // opened. From then on the series are memoized on the rows alone, so switching tabs away and
+  // back reuses them instead of rebuilding.
+  const [profilesOpened, setProfilesOpened] = useState(activeTab === "profiles");
+  if (activeTab === "profiles" && !profilesOpened) {
+    setProfilesOpened(true);
+  }
+  const temperatureSeries = useMemo(
+    () => (profilesOpened ? buildProfileSeries(workingData, "temperature") : EMPTY_PROFILE_SERIES),
+    [profilesOpened, workingData],
   );
-  const hasSalProfileData = useMemo(
-    () => workingData.length > 0 && "salinity" in workingData[0] && "pressure" in workingData[0],
-    [workingData],
+  const salinitySeries = useMemo(
+    () => (profilesOpened ? buildProfileSeries(workingData, "salinity") : EMPTY_PROFILE_SERIES),
+    [profilesOpened, workingData],
+  );
+
+  // Chart traces are rebuilt only when their rows change, so re-renders triggered by
+  // unrelated state hand Plotly the same arrays and it can skip recomputing the figure.
+  const mapTraces = useMemo<Data[]>(
+    () => [
+      {
+        type: "scattergeo",
+        lat: locationPoints.map((point) => point.lat),
+        lon: locationPoints.map((point) => point.lon),
+        // Plotly formats the hover label from customdata, so no per-point string is built here.
+        customdata: locationPoints.map((point) => point.floatId),
+        hovertemplate: "Float: %{customdata}<br>(%{lat}, %{lon})<extra></extra>",
+        mode: "markers",
+        marker: { color: "#2563eb", size: 10, opacity: 0.85 },
+      },
+    ],
+    [locationPoints],
+  );
+
+  const temperatureTraces = useMemo<Data[]>(
+    () => [
+      {
+        type: profileTraceType(temperatureSeries.values.length),
+        x: temperatureSeries.values,
+        y: temperatureSeries.pressures,
+        mode: "lines+markers",
+        line: { color: "#0ea5e9", width: 3 },
+      },
+    ],
+    [temperatureSeries],
+  );
+
+  const salinityTraces = useMemo<Data[]>(
+    () => [
+      {
+        type: profileTraceType(salinitySeries.values.length),
+        x: salinitySeries.values,
+        y: salinitySeries.pressures,
+        mode: "lines+markers",
+        line: { color: "#6366f1", width: 3 },
+      },
+    ],
+    [salinitySeries],
   );
 
   const floatOptions = useMemo(() => {
@@ -467,35 +721,12 @@ const DataVisualization = ({
               </div>
             ) : (
               <Suspense fallback={<PlotFallback label="Loading map" />}>
-                <Plot
-                  data={[
-                    {
-                      type: "scattergeo",
-                      lat: locationPoints.map((point) => point.lat),
-                      lon: locationPoints.map((point) => point.lon),
-                      text: locationPoints.map((point) => `Float: ${point.floatId}`),
-                      mode: "markers",
-                      marker: { color: "#2563eb", size: 10, opacity: 0.85 },
-                    },
-                  ]}
-                  layout={{
-                    geo: {
-                      scope: "world",
-                      showland: true,
-                      landcolor: "#f1f5f9",
-                      oceancolor: "#e2e8f0",
-                      lakecolor: "#e2e8f0",
-                      projection: { type: "natural earth" },
-                      lonaxis: { showgrid: true, gridcolor: "rgba(148, 163, 184, 0.3)", dtick: 30 },
-                      lataxis: { showgrid: true, gridcolor: "rgba(148, 163, 184, 0.3)", dtick: 15 },
-                    },
-                    margin: { r: 0, t: 10, b: 0, l: 0 },
-                    paper_bgcolor: "rgba(0,0,0,0)",
-                    plot_bgcolor: "rgba(0,0,0,0)",
-                  }}
-                  style={{ width: "100%", height: "100%" }}
+                <GeoPlot
+                  data={mapTraces}
+                  layout={MAP_LAYOUT}
+                  style={MAP_STYLE}
                   useResizeHandler
-                  config={{ displayModeBar: false, responsive: true }}
+                  config={MAP_CONFIG}
                 />
               </Suspense>
             )}
@@ -506,23 +737,10 @@ const DataVisualization = ({
           <TabsContent value="profiles" className="mt-2 grid flex-1 min-h-0 grid-cols-1 gap-4 overflow-auto rounded-[28px] border border-white/20 bg-white/85 p-6 shadow-[0_35px_70px_-50px_rgba(15,23,42,0.55)] backdrop-blur-2xl dark:border-white/10 dark:bg-white/[0.05] dark:shadow-[0_45px_90px_-55px_rgba(2,6,23,0.85)] md:grid-cols-2">
             {hasTempProfileData ? (
               <Suspense fallback={<PlotFallback label="Loading temperature profile" />}>
-                <Plot
-                  data={[
-                    {
-                      x: workingData.map((r) => r.temperature),
-                      y: workingData.map((r) => r.pressure),
-                      mode: "lines+markers",
-                      line: { color: "#0ea5e9", width: 3 },
-                    },
-                  ]}
-                  layout={{
-                    title: { text: "Temperature vs. Depth" },
-                    paper_bgcolor: "rgba(0,0,0,0)",
-                    plot_bgcolor: "rgba(0,0,0,0)",
-                    yaxis: { autorange: "reversed", title: { text: "Pressure (dbar)" }, gridcolor: "rgba(148, 163, 184, 0.3)" },
-                    xaxis: { title: { text: "Temperature (°C)" }, gridcolor: "rgba(148, 163, 184, 0.3)" },
-                  }}
-                  style={{ width: "100%", height: "360px" }}
+                <ProfilePlot
+                  data={temperatureTraces}
+                  layout={TEMPERATURE_PROFILE_LAYOUT}
+                  style={PROFILE_STYLE}
                   useResizeHandler
                 />
               </Suspense>
@@ -534,23 +752,10 @@ const DataVisualization = ({
 
             {hasSalProfileData ? (
               <Suspense fallback={<PlotFallback label="Loading salinity profile" />}>
-                <Plot
-                  data={[
-                    {
-                      x: workingData.map((r) => r.salinity),
-                      y: workingData.map((r) => r.pressure),
-                      mode: "lines+markers",
-                      line: { color: "#6366f1", width: 3 },
-                    },
-                  ]}
-                  layout={{
-                    title: { text: "Salinity vs. Depth" },
-                    paper_bgcolor: "rgba(0,0,0,0)",
-                    plot_bgcolor: "rgba(0,0,0,0)",
-                    yaxis: { autorange: "reversed", title: { text: "Pressure (dbar)" }, gridcolor: "rgba(148, 163, 184, 0.3)" },
-                    xaxis: { title: { text: "Salinity (PSU)" }, gridcolor: "rgba(148, 163, 184, 0.3)" },
-                  }}
-                  style={{ width: "100%", height: "360px" }}
+                <ProfilePlot
+                  data={salinityTraces}
+                  layout={SALINITY_PROFILE_LAYOUT}
+                  style={PROFILE_STYLE}
                   useResizeHandler
                 />
               </Suspense>
@@ -0,0 +1,27 @@
+// Lazy loaders for the Plotly charts used by the dashboard.
+// The default react-plotly.js entry pulls in every Plotly trace type. Instead, each
+// loader pairs the component factory with the prebuilt partial bundle that covers
+// only the traces it renders, so a tab downloads just the bundle it needs.
+
+import type { ComponentType } from "react";
+import type { PlotParams } from "react-plotly.js";
+
+type PlotModule = { default: ComponentType<PlotParams> };
+
+// scatter + scattergeo, used by the Ocean Map tab.
+export const loadGeoPlot = async (): Promise<PlotModule> => {
+  const [{ default: createPlotlyComponent }, { default: Plotly }] = await Promise.all([
+    import("react-plotly.js/factory"),
+    import("plotly.js/dist/plotly-geo.min"),
+  ]);
+  return { default: createPlotlyComponent(Plotly) };
+};
+
+// scatter + scattergl, used by the depth profile charts.
+export const loadProfilePlot = async (): Promise<PlotModule> => {
+  const [{ default: createPlotlyComponent }, { default: Plotly }] = await Promise.all([
+    import("react-plotly.js/factory"),
+    import("plotly.js/dist/plotly-gl2d.min"),
+  ]);
+  return { default: createPlotlyComponent(Plotly) };
+};
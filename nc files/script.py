@@ -1,5 +1,9 @@
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
 
 # Base URL for the data
 base_url = "https://data-argo.ifremer.fr/dac/incois/"
@@ -12,62 +16,83 @@ float_ids = [
     "5907083", "4903775"
 ]
 
-def download_profiles(float_id):
+# Downloads are network-bound, so overlap them across a pool of threads
+MAX_DOWNLOAD_WORKERS = 16
+MAX_FLOAT_WORKERS = 4
+
+# Write downloads to disk in 1 MB blocks rather than 8 KB Python-level chunks
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Matches the .nc links in the directory listing; runs on the raw bytes so
+# the page never has to be decoded or split into lines
+NC_LINK_RE = re.compile(rb'href="([^"]+\.nc)"')
+
+# One shared session keeps connections alive between files instead of
+# paying a new TCP/TLS handshake per request
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_DOWNLOAD_WORKERS + MAX_FLOAT_WORKERS))
+
+def download_file(float_id, file_url, local_path):
+    """Download a single .nc file unless it already exists locally"""
+    # Skip if file already exists
+    if os.path.exists(local_path):
+        print(f"[{float_id}] Skipping {file_url} (already exists)")
+        return
+
+    # Download into a .part file and only rename it once complete, so an
+    # interrupted download is never mistaken for a finished file on the next run
+    part_path = local_path + ".part"
+    try:
+        print(f"[{float_id}] Downloading {file_url}...")
+        with session.get(file_url, stream=True) as response:
+            response.raise_for_status()
+
+            with open(part_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(part_path, local_path)
+        print(f"[{float_id}] Saved to {local_path}")
+    except requests.exceptions.RequestException as e:
+        print(f"[{float_id}] Failed to download {file_url}: {e}")
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+def download_profiles(float_id, file_pool):
     """Download all .nc files from the profiles subfolder for a given float ID"""
+    # Floats are processed concurrently, so every line is tagged with its float ID
+    # rather than relying on a header printed before that float's downloads
+    print(f"[{float_id}] Processing float ID: {float_id}")
     profiles_url = f"{base_url}{float_id}/profiles/"
     
     # Get the list of files in the profiles directory
     try:
-        response = requests.get(profiles_url)
+        response = session.get(profiles_url)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
-        print(f"Failed to access {profiles_url}: {e}")
+        print(f"[{float_id}] Failed to access {profiles_url}: {e}")
         return
         
-    # Parse the HTML to find all .nc files (this is a simple approach)
-    # A more robust solution would use BeautifulSoup or similar
-    files = []
-    for line in response.text.split('\n'):
-        if '.nc"' in line:
-            file_start = line.find('href="') + len('href="')
-            file_end = line.find('"', file_start)
-            file_name = line[file_start:file_end]
-            if file_name.endswith('.nc'):
-                files.append(file_name)
+    # Pull every .nc link out of the HTML listing in a single regex scan
+    files = [link.decode() for link in NC_LINK_RE.findall(response.content)]
     
     if not files:
-        print(f"No .nc files found in {profiles_url}")
+        print(f"[{float_id}] No .nc files found in {profiles_url}")
         return
     
     # Create local profiles directory if it doesn't exist
     local_profiles_dir = os.path.join(float_id, "profiles")
     os.makedirs(local_profiles_dir, exist_ok=True)
     
-    # Download each file
-    for file_name in files:
-        file_url = f"{profiles_url}{file_name}"
-        local_path = os.path.join(local_profiles_dir, file_name)
-        
-        # Skip if file already exists
-        if os.path.exists(local_path):
-            print(f"Skipping {file_url} (already exists)")
-            continue
-            
-        try:
-            print(f"Downloading {file_url}...")
-            response = requests.get(file_url, stream=True)
-            response.raise_for_status()
-            
-            with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            print(f"Saved to {local_path}")
-        except requests.exceptions.RequestException as e:
-            print(f"Failed to download {file_url}: {e}")
+    # Download the files concurrently
+    file_urls = [f"{profiles_url}{file_name}" for file_name in files]
+    local_paths = [os.path.join(local_profiles_dir, file_name) for file_name in files]
+    list(file_pool.map(download_file, [float_id] * len(files), file_urls, local_paths))
 
-# Download profiles for all float IDs
-for float_id in float_ids:
-    print(f"\nProcessing float ID: {float_id}")
-    download_profiles(float_id)
+# Download profiles for all float IDs; floats are listed in parallel and
+# share one pool of file downloaders
+with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as file_pool, \
+        ThreadPoolExecutor(max_workers=MAX_FLOAT_WORKERS) as float_pool:
+    list(float_pool.map(lambda float_id: download_profiles(float_id, file_pool), float_ids))
 
 print("\nDownload complete!")
\ No newline at end of file